@@ -3,12 +3,61 @@ import plotly.graph_objects as go
 from transformers.pipelines import pipeline
 import praw
 from datetime import datetime, timezone
+import csv
+import math
+import os
+import random
+import re
 import requests
 
 # ------------------- PARAMETRE -------------------
 
 MAX_COMMENTS = 200        # max kommentarer vi analyserer pr. aktie (Reddit)
 MAX_POSTS_SCAN = 400      # hvor mange af de nyeste WSB-opslag vi tjekker titlen på
+
+# Adaptiv stikprøve (Reddit): stratificeret på tværs af tråde + tidligt stop
+MAX_COMMENTS_POOL = 2000      # max kommentarer vi henter ind som pulje at trække fra (fordeles ligeligt på tråde)
+ADAPTIVE_MAX_COMMENTS = 800   # hårdt loft over analyserede kommentarer i adaptiv mode
+ADAPTIVE_MIN_COMMENTS = 50    # analysér mindst så mange før vi må stoppe
+SAMPLE_BATCH_SIZE = 25        # kommentarer pr. FinBERT-batch
+CI_TARGET_WIDTH = 30          # stop når 95%-intervallet på scoren er smallere end dette
+CI_Z = 1.96                   # z-værdi for 95%-konfidensinterval
+
+# Hurtigt leksikon-filter før FinBERT (kaskade)
+LEXICON_MIN_SCORE = 2         # |leksikon-score| der skal til, før vi afgør bullish/bearish uden FinBERT
+LEXICON_MIN_HITS = 2          # antal signalord der skal til – ét enkelt ord afgør aldrig en tekst
+CASCADE_FIXTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cascade_fixtures.csv")
+
+# Finans-/WSB-leksikon (lowercased enkeltord og emojis) med vægt: + bullish, - bearish
+WSB_LEXICON = {
+    # bullish
+    "moon": 2, "🚀": 2, "🌙": 1, "📈": 1, "💎": 1, "🙌": 1,
+    "bullish": 2, "bull": 1, "bulls": 1, "tendies": 2, "calls": 1,
+    "buy": 1, "buying": 1, "bought": 1, "long": 1, "undervalued": 2,
+    "beat": 1, "upgrade": 2, "squeeze": 2, "breakout": 2,
+    "growth": 1, "rally": 2,
+    # bearish
+    "bearish": -2, "bear": -1, "bears": -1, "🐻": -1, "📉": -2, "puts": -1,
+    "crash": -2, "dump": -2, "tank": -2, "bubble": -2, "recession": -2,
+    "bagholding": -2, "bagholder": -2, "overvalued": -2, "shorting": -1,
+    "miss": -1, "downgrade": -2, "cut": -1, "sell": -1, "sold": -1,
+    "loss": -1, "losses": -1, "lost": -1, "falling": -1,
+}
+
+# Ord der vender eller nuancerer betydningen – så lader vi FinBERT tage stilling.
+# Alle tokens der ender på "n't" tæller også med (se lexicon_prescreen).
+LEXICON_HEDGE_WORDS = {
+    "not", "no", "never", "nobody", "nothing", "none", "nor", "neither", "without",
+    "dont", "doesnt", "didnt", "isnt", "arent", "wasnt", "werent",
+    "cant", "cannot", "wont", "wouldnt", "shouldnt", "couldnt", "aint",
+    "but", "should", "if", "unless", "though",
+}
+
+# Spørgsmål der starter med et af disse ord og ikke rummer signalord, regnes som neutrale
+LEXICON_QUESTION_WORDS = {"what", "when", "where", "which", "who", "anyone"}
+
+LEXICON_TOKEN_RE = re.compile(r"[a-z0-9$']+|[🚀🌙📈📉💎🙌🐻]")
+
 NEWS_API_URL = "https://newsapi.org/v2/everything"
 
 # Udvidede keywords pr. aktie (uppercased) – bruges til Reddit TITLER
@@ -81,6 +130,18 @@ Neutrale tekster tæller med i fordelingen, men påvirker ikke selve scoren.
 - For hvert sådant opslag hentes kommentarerne, renses let (fjern spam, meget korte eller
   ekstremt lange tekster), og FinBERT vurderer dem som bullish/bearish/neutral.
 - På den måde får du et billede af **retail/WSB-stemningen** i de nyeste tråde om aktien.
+- Med **leksikon-filteret** slået til vurderes hver kommentar først med en simpel liste af
+  finans-/WSB-ord og emojis (fx *moon*, 🚀, *puts*, *crash*). Kun helt oplagte tilfælde
+  afgøres her – blandede signaler, negationer og forbehold sendes stadig til FinBERT.
+- Med **adaptiv stikprøve** slået til trækkes kommentarerne skiftevis fra alle de
+  matchede tråde (så én stor tråd ikke fylder det hele), og de analyseres i små portioner.
+  Efter hver portion beregnes et **95%-konfidensinterval** for scoren, og analysen stopper,
+  når intervallet er smalt nok – eller fortsætter ud over 200 kommentarer, hvis det stadig
+  er bredt. Intervallet vises som et skraveret bånd på måleren.
+- Intervallet er en **tommelfingerregel**, ikke en eksakt garanti: kommentarer i samme tråd
+  ligner hinanden, så intervallet gøres bredere, jo mere trådene er uenige indbyrdes. Men
+  fordi vi tjekker efter hver portion og stopper ved første smalle interval, er det stadig
+  lidt for optimistisk – især når næsten alle kommentarer peger samme vej.
 
 ---
 
@@ -158,17 +219,166 @@ def score_to_text(score_100: int) -> str:
     else:
         return "meget bearish"
 
+def score_confidence_interval(n_bull: int, n_bear: int, clusters=None):
+    """95%-interval (Wilson) for scoren -100..100 ud fra antal bullish/bearish.
+
+    Scoren er 100 * (2p - 1), hvor p er andelen af bullish blandt de polære tekster,
+    så intervallet for p kan oversættes direkte. Returnerer None uden polære tekster.
+
+    Wilson antager uafhængige træk, men kommentarer fra samme tråd ligner hinanden.
+    Gives `clusters` som (n_bull, n_bear) pr. tråd, skønnes variansen pr. tråd, og
+    stikprøven krympes med design-effekten (n_eff = n / deff). Intervallet er stadig
+    lidt for smalt, når det bruges som stopregel efter hver portion (gentagne kig), og
+    med kun én tråd eller en enstemmig stikprøve kan design-effekten ikke skønnes.
+    """
+    n = n_bull + n_bear
+    if n == 0:
+        return None
+    p = n_bull / n
+
+    n_eff = n
+    if clusters and 0 < p < 1:
+        polar = [(b, b + r) for b, r in clusters if b + r > 0]
+        k = len(polar)
+        if k >= 2:
+            var_cluster = k / (k - 1) * sum((b - p * m) ** 2 for b, m in polar) / n ** 2
+            deff = max(1.0, var_cluster / (p * (1 - p) / n))
+            n_eff = n / deff
+
+    z2 = CI_Z ** 2
+    center = (p + z2 / (2 * n_eff)) / (1 + z2 / n_eff)
+    half = CI_Z * math.sqrt(p * (1 - p) / n_eff + z2 / (4 * n_eff * n_eff)) / (1 + z2 / n_eff)
+    lo = max(0.0, center - half)
+    hi = min(1.0, center + half)
+    return (100 * (2 * lo - 1), 100 * (2 * hi - 1))
+
+def label_to_sentiment(label: str) -> str:
+    """Omsætter FinBERT-label til Bullish / Bearish / Neutral."""
+    label = label.lower()  # "positive", "negative", "neutral"
+    if label == "positive":
+        return "Bullish"
+    elif label == "negative":
+        return "Bearish"
+    return "Neutral"
+
+def lexicon_prescreen(text: str):
+    """Hurtig første vurdering med WSB-leksikonet.
+
+    Giver sentiment_word, når teksten er oplagt, ellers None (= send til FinBERT).
+    Leksikonet giver ingen sandsynlighed, så der returneres ingen conf.
+    Blandede signaler, negationer, forbehold, spørgsmål med signalord, tekster med kun
+    ét signalord og tekster uden kendte ord sendes videre – WSB-slang er åben, så
+    "intet kendt ord" betyder usikker, ikke neutral.
+    """
+    # iOS og mange Reddit-klienter skriver ’ i stedet for '
+    text = text.replace("\u2019", "'")
+    tokens = LEXICON_TOKEN_RE.findall(text.lower())
+    if any(tok in LEXICON_HEDGE_WORDS or tok.endswith("n't") for tok in tokens):
+        return None
+
+    weights = [WSB_LEXICON[t] for t in tokens if t in WSB_LEXICON]
+
+    if not weights:
+        # Kun klare, enkelte spørgsmål ("When is the earnings call?") afgøres som neutrale
+        stripped = text.strip()
+        if (
+            tokens
+            and tokens[0] in LEXICON_QUESTION_WORDS
+            and stripped.endswith("?")
+            and stripped.count("?") == 1
+        ):
+            return "Neutral"
+        return None
+
+    # "Will TSLA crash tomorrow?" er et spørgsmål, ikke en holdning
+    if "?" in text:
+        return None
+
+    # Kun ét fortegn tæller som oplagt
+    if any(w > 0 for w in weights) and any(w < 0 for w in weights):
+        return None
+
+    total = sum(weights)
+    if len(weights) < LEXICON_MIN_HITS or abs(total) < LEXICON_MIN_SCORE:
+        return None
+
+    return "Bullish" if total > 0 else "Bearish"
+
+def classify_batch(texts, cascade: bool = False):
+    """Kører FinBERT på en liste tekster. Giver (sentiment_word, conf, stage) eller None pr. tekst.
+
+    Med cascade=True afgøres oplagte tekster af leksikonet (stage "lexicon", conf None), og
+    kun de usikre sendes til FinBERT (stage "finbert").
+    """
+    out = [None] * len(texts)
+    pending = []  # indeks på tekster der skal til FinBERT
+
+    for i, text in enumerate(texts):
+        pre = lexicon_prescreen(text) if cascade else None
+        if pre is not None:
+            out[i] = (pre, None, "lexicon")
+        else:
+            pending.append(i)
+
+    if not pending:
+        return out
+
+    try:
+        results = ai([texts[i] for i in pending], batch_size=len(pending))
+        for i, r in zip(pending, results):
+            out[i] = (label_to_sentiment(r["label"]), r["score"], "finbert")
+        return out
+    except Exception:
+        pass
+
+    # Fald tilbage til én ad gangen, så én dårlig tekst ikke vælter hele portionen
+    for i in pending:
+        try:
+            result = ai(texts[i])[0]
+            out[i] = (label_to_sentiment(result["label"]), result["score"], "finbert")
+        except Exception:
+            out[i] = None
+    return out
+
+def interleave_threads(threads, rng):
+    """Stratificeret rækkefølge: blander hver tråd og tager så én kommentar fra hver på skift.
+
+    Giver (thread_idx, item), så tællingerne kan grupperes pr. tråd bagefter.
+    """
+    shuffled = []
+    for idx, thread in enumerate(threads):
+        thread = [(idx, item) for item in thread]
+        rng.shuffle(thread)
+        shuffled.append(thread)
+
+    order = []
+    for i in range(max((len(t) for t in shuffled), default=0)):
+        for thread in shuffled:
+            if i < len(thread):
+                order.append(thread[i])
+    return order
+
 # ------------------- HENT & ANALYSER KOMMENTARER (REDDIT) -------------------
 
 @st.cache_data(ttl=300)  # cache 5 minutter
-def get_reddit_sentiment(symbol: str):
+def get_reddit_sentiment(
+    symbol: str,
+    adaptive: bool = False,
+    ci_width: float = CI_TARGET_WIDTH,
+    cascade: bool = False,
+):
     reddit = get_reddit_client()
     subreddit = reddit.subreddit("wallstreetbets")
 
     sym_up = symbol.upper()
     keywords = COMPANY_KEYWORDS.get(sym_up, [sym_up, f"${sym_up}"])
 
-    comments = []          # liste af (text, title)
+    # Fast mode: de første MAX_COMMENTS i listens rækkefølge.
+    # Adaptiv mode: en større pulje, som vi trækker stratificeret fra.
+    pool_limit = MAX_COMMENTS_POOL if adaptive else MAX_COMMENTS
+
+    threads = []           # én liste af (text, title) pr. tråd
+    n_collected = 0
     posts_used_ids = set()
     fetch_time = datetime.now(timezone.utc)
 
@@ -182,13 +392,23 @@ def get_reddit_sentiment(symbol: str):
 
     try:
         # 1) Gå igennem de nyeste WSB-opslag (ikke søgeindeks)
-        for submission in subreddit.new(limit=MAX_POSTS_SCAN):
-            title_up = submission.title.upper()
-            # Kun tråde hvor titlen matcher et keyword
-            if not any(kw in title_up for kw in keywords):
-                continue
+        #    Kun tråde hvor titlen matcher et keyword
+        matched = [
+            submission
+            for submission in subreddit.new(limit=MAX_POSTS_SCAN)
+            if any(kw in submission.title.upper() for kw in keywords)
+        ]
+
+        # Samme tråde giver samme stikprøve – også efter cache-refresh
+        rng = random.Random(f"{sym_up}:" + ",".join(sorted(sub.id for sub in matched)))
+
+        # Adaptiv mode: hver tråd må højst fylde sin andel af puljen
+        per_thread_limit = max(1, MAX_COMMENTS_POOL // len(matched)) if matched else 0
 
+        for submission in matched:
             posts_used_ids.add(submission.id)
+            thread_comments = []
+            threads.append(thread_comments)
 
             # Hent alle kommentarer i den tråd
             submission.comments.replace_more(limit=0)
@@ -205,14 +425,20 @@ def get_reddit_sentiment(symbol: str):
                     continue
 
                 # Vi kræver ikke keywords i kommentaren – tråden handler om aktien
-                comments.append((text, submission.title))
+                thread_comments.append((text, submission.title))
 
-                if len(comments) >= MAX_COMMENTS:
+                if not adaptive and n_collected + len(thread_comments) >= pool_limit:
                     break
-            if len(comments) >= MAX_COMMENTS:
+
+            if adaptive and len(thread_comments) > per_thread_limit:
+                # Tilfældigt udsnit i stedet for de første i trådens rækkefølge
+                thread_comments[:] = rng.sample(thread_comments, per_thread_limit)
+
+            n_collected += len(thread_comments)
+            if n_collected >= pool_limit:
                 break
 
-        raw_comments_count = len(comments)
+        raw_comments_count = n_collected
         posts_used = len(posts_used_ids)
 
         if raw_comments_count == 0:
@@ -228,27 +454,42 @@ def get_reddit_sentiment(symbol: str):
                 posts_used,
                 raw_comments_count,
                 fetch_time,
+                None,
+                0,
             )
 
-        analyzed = []  # (text, title, sentiment_word, conf)
-
-        # 2) Kør FinBERT på ALLE kommentarer i de valgte tråde
-        for text, title in comments:
-            try:
-                result = ai(text)[0]
-                label = result["label"].lower()  # "positive", "negative", "neutral"
-                conf = result["score"]
-
-                if label == "positive":
-                    sentiment_word = "Bullish"
-                elif label == "negative":
-                    sentiment_word = "Bearish"
-                else:
-                    sentiment_word = "Neutral"
-
-                analyzed.append((text, title, sentiment_word, conf))
-            except Exception:
-                continue
+        if adaptive:
+            comments = interleave_threads(threads, rng)[:ADAPTIVE_MAX_COMMENTS]
+        else:
+            comments = [(idx, item) for idx, thread in enumerate(threads) for item in thread]
+
+        analyzed = []  # (text, title, sentiment_word, conf, stage)
+        n_bull = n_bear = 0
+        thread_counts = [[0, 0] for _ in threads]  # (bullish, bearish) pr. tråd
+        n_prescreened = 0  # afgjort af leksikonet uden FinBERT
+
+        # 2) Kør FinBERT i portioner. I adaptiv mode stopper vi, når intervallet er smalt nok.
+        for start in range(0, len(comments), SAMPLE_BATCH_SIZE):
+            batch = comments[start:start + SAMPLE_BATCH_SIZE]
+            texts = [text for _, (text, _) in batch]
+            for (idx, (text, title)), res in zip(batch, classify_batch(texts, cascade=cascade)):
+                if res is None:
+                    continue
+                sentiment_word, conf, stage = res
+                if stage == "lexicon":
+                    n_prescreened += 1
+                analyzed.append((text, title, sentiment_word, conf, stage))
+                if sentiment_word == "Bullish":
+                    n_bull += 1
+                    thread_counts[idx][0] += 1
+                elif sentiment_word == "Bearish":
+                    n_bear += 1
+                    thread_counts[idx][1] += 1
+
+            if adaptive and len(analyzed) >= ADAPTIVE_MIN_COMMENTS:
+                ci = score_confidence_interval(n_bull, n_bear, thread_counts)
+                if ci is not None and ci[1] - ci[0] <= ci_width:
+                    break
 
         if not analyzed:
             return (
@@ -263,12 +504,12 @@ def get_reddit_sentiment(symbol: str):
                 posts_used,
                 raw_comments_count,
                 fetch_time,
+                None,
+                0,
             )
 
         # 3) Tæl bullish / bearish / neutral
-        n_bull = sum(1 for _, _, s, _ in analyzed if s == "Bullish")
-        n_bear = sum(1 for _, _, s, _ in analyzed if s == "Bearish")
-        n_neutral = sum(1 for _, _, s, _ in analyzed if s == "Neutral")
+        n_neutral = len(analyzed) - n_bull - n_bear
         n_total = n_bull + n_bear + n_neutral
 
         if n_bull + n_bear > 0:
@@ -276,12 +517,18 @@ def get_reddit_sentiment(symbol: str):
         else:
             score_100 = 0
 
-        # 4) Find bedste bullish og bedste bearish eksempel
+        score_ci = score_confidence_interval(n_bull, n_bear, thread_counts)
+
+        # 4) Find bedste bullish og bedste bearish eksempel.
+        #    Leksikonet har ingen model-sikkerhed (conf None), så FinBERT-afgjorte foretrækkes.
         bull_candidates = [item for item in analyzed if item[2] == "Bullish"]
         bear_candidates = [item for item in analyzed if item[2] == "Bearish"]
 
-        bull_example = max(bull_candidates, key=lambda x: x[3]) if bull_candidates else None
-        bear_example = max(bear_candidates, key=lambda x: x[3]) if bear_candidates else None
+        def example_key(item):
+            return (item[4] == "finbert", item[3] if item[3] is not None else 0.0)
+
+        bull_example = max(bull_candidates, key=example_key) if bull_candidates else None
+        bear_example = max(bear_candidates, key=example_key) if bear_candidates else None
 
         return (
             score_100,
@@ -295,6 +542,8 @@ def get_reddit_sentiment(symbol: str):
             posts_used,
             raw_comments_count,
             fetch_time,
+            score_ci,
+            n_prescreened,
         )
 
     except Exception as e:
@@ -308,10 +557,69 @@ def get_reddit_sentiment(symbol: str):
             0,
             0,
             len(posts_used_ids),
-            len(comments),
+            n_collected,
             fetch_time,
+            None,
+            0,
         )
 
+# ------------------- KALIBRERING AF KASKADEN -------------------
+
+def cascade_metrics(rows):
+    """Nøgletal for et sæt (text, label, finbert_word, cascade_word, stage)-rækker."""
+    n = len(rows)
+    if n == 0:
+        return None
+
+    lexicon_rows = [r for r in rows if r[4] == "lexicon"]
+
+    def score_of(words):
+        n_bull = sum(1 for w in words if w == "Bullish")
+        n_bear = sum(1 for w in words if w == "Bearish")
+        return round(100 * (n_bull - n_bear) / (n_bull + n_bear)) if n_bull + n_bear else 0
+
+    return {
+        "n": n,
+        "n_lexicon": len(lexicon_rows),
+        "calls_saved": len(lexicon_rows) / n,
+        "agreement": sum(1 for r in rows if r[2] == r[3]) / n,
+        "agreement_lexicon": (
+            sum(1 for r in lexicon_rows if r[2] == r[3]) / len(lexicon_rows)
+            if lexicon_rows else None
+        ),
+        "acc_finbert": sum(1 for r in rows if r[2] == r[1]) / n,
+        "acc_cascade": sum(1 for r in rows if r[3] == r[1]) / n,
+        "score_finbert": score_of(r[2] for r in rows),
+        "score_cascade": score_of(r[3] for r in rows),
+        "disagreements": [(r[0], r[1], r[2], r[3]) for r in lexicon_rows if r[2] != r[3]],
+    }
+
+@st.cache_data
+def run_cascade_calibration():
+    """Sammenligner kaskaden (leksikon -> FinBERT) med ren FinBERT på de mærkede fixtures.
+
+    Leksikonet og dets regler er justeret med alle fixtures for øje, så tallene er
+    optimistiske. Der er intet uafhængigt holdout-sæt.
+    """
+    with open(CASCADE_FIXTURES_PATH, newline="", encoding="utf-8") as f:
+        fixtures = [(row["text"], row["label"]) for row in csv.DictReader(f)]
+
+    texts = [text for text, _ in fixtures]
+    finbert_only = classify_batch(texts)
+    prescreen = [lexicon_prescreen(text) for text in texts]
+
+    rows = []  # (text, label, finbert_word, cascade_word, stage)
+    for (text, label), fb, pre in zip(fixtures, finbert_only, prescreen):
+        if fb is None:
+            continue
+        # Kaskaden genbruger FinBERT-svaret for de tekster, leksikonet ikke kan afgøre
+        if pre is not None:
+            rows.append((text, label, fb[0], pre, "lexicon"))
+        else:
+            rows.append((text, label, fb[0], fb[0], "finbert"))
+
+    return cascade_metrics(rows)
+
 # ------------------- HENT & ANALYSER NYHEDER -------------------
 
 @st.cache_data(ttl=600)  # cache 10 minutter
@@ -377,16 +685,9 @@ def get_news_sentiment(symbol: str):
 
             try:
                 result = ai(text)[0]
-                label = result["label"].lower()  # "positive", "negative", "neutral"
+                sentiment_word = label_to_sentiment(result["label"])
                 conf = result["score"]
 
-                if label == "positive":
-                    sentiment_word = "Bullish"
-                elif label == "negative":
-                    sentiment_word = "Bearish"
-                else:
-                    sentiment_word = "Neutral"
-
                 analyzed.append((title, url, sentiment_word, conf))
             except Exception:
                 continue
@@ -456,12 +757,67 @@ def get_news_sentiment(symbol: str):
 stocks = ["TSLA", "PLTR", "SPY"]
 names = ["Tesla", "Palantir", "S&P 500 (SPY)"]
 
+# Stikprøve-indstillinger for Reddit
+adaptive_sampling = st.toggle(
+    "Adaptiv stikprøve (stratificeret på tværs af tråde, stop ved smalt konfidensinterval)",
+    value=False,
+)
+ci_width = CI_TARGET_WIDTH
+if adaptive_sampling:
+    ci_width = st.slider(
+        "Ønsket bredde på 95%-interval (scorepoint)",
+        min_value=5,
+        max_value=60,
+        value=CI_TARGET_WIDTH,
+        step=5,
+    )
+
+cascade_enabled = st.toggle(
+    "Hurtigt leksikon-filter før FinBERT (oplagte kommentarer afgøres uden transformer)",
+    value=False,
+)
+
+with st.expander("Kalibrering af leksikon-filteret"):
+    st.markdown(
+        "Kører både ren FinBERT og kaskaden (leksikon → FinBERT) på et lille sæt "
+        "håndmærkede WSB-kommentarer og viser, hvor enige de er, og hvor mange "
+        "FinBERT-kald filteret sparer."
+    )
+    st.caption(
+        "Leksikonet og dets regler er justeret med netop disse tekster for øje, så tallene "
+        "er pænere end virkeligheden. Et ærligt mål kræver et uafhængigt sæt mærkede kommentarer."
+    )
+    if st.button("Kør kalibrering"):
+        report = run_cascade_calibration()
+        if report is None:
+            st.info("Kunne ikke analysere kalibreringsteksterne lige nu.")
+        else:
+            st.markdown(
+                f"- Tekster: **{report['n']}**, heraf **{report['n_lexicon']}** afgjort af leksikonet  \n"
+                f"- Sparede FinBERT-kald: **{report['calls_saved']:.0%}**  \n"
+                f"- Enighed med ren FinBERT: **{report['agreement']:.0%}** samlet"
+                + (
+                    f", **{report['agreement_lexicon']:.0%}** blandt leksikon-afgjorte"
+                    if report["agreement_lexicon"] is not None
+                    else ""
+                )
+                + "  \n"
+                f"- Træfsikkerhed mod håndmærkning: FinBERT **{report['acc_finbert']:.0%}** · "
+                f"kaskade **{report['acc_cascade']:.0%}**  \n"
+                f"- Score på sættet: FinBERT **{report['score_finbert']}** · "
+                f"kaskade **{report['score_cascade']}**"
+            )
+            for text, label, fb_word, lex_word in report["disagreements"]:
+                st.caption(f"Uenighed: *{text}* – leksikon: {lex_word}, FinBERT: {fb_word}, mærket: {label}")
+
 # Hent Reddit-data til alle aktier med progress bar
 results_reddit = {}
 progress = st.progress(0, text="Indlæser Reddit-data...")
 
 for i, symbol in enumerate(stocks):
-    results_reddit[symbol] = get_reddit_sentiment(symbol)
+    results_reddit[symbol] = get_reddit_sentiment(
+        symbol, adaptive_sampling, ci_width, cascade_enabled
+    )
     progress.progress((i + 1) / len(stocks), text=f"Indlæser Reddit for {symbol} ({i+1}/{len(stocks)})")
 
 progress.empty()
@@ -490,6 +846,8 @@ for col, (name, symbol) in zip(cols, zip(names, stocks)):
         posts_used,
         raw_comments_count,
         fetch_time,
+        score_ci,
+        n_prescreened,
     ) = results_reddit[symbol]
 
     with col:
@@ -504,6 +862,13 @@ for col, (name, symbol) in zip(cols, zip(names, stocks)):
                 f"Score: **{score_100}** (−100 bearish, 0 neutral, +100 bullish)."
             )
 
+            # Konfidensintervallet vises som et skraveret bånd på måleren
+            ci_steps = []
+            if score_ci is not None:
+                ci_steps.append(
+                    {"range": [score_ci[0], score_ci[1]], "color": "rgba(128, 128, 128, 0.3)"}
+                )
+
             fig = go.Figure(
                 go.Indicator(
                     mode="gauge+number",
@@ -518,6 +883,7 @@ for col, (name, symbol) in zip(cols, zip(names, stocks)):
                             if score_100 < -10
                             else "gray"
                         },
+                        "steps": ci_steps,
                     },
                 )
             )
@@ -532,6 +898,16 @@ for col, (name, symbol) in zip(cols, zip(names, stocks)):
             st.caption(
                 f"Fordeling: 🐂 {n_bull} bullish · 🐻 {n_bear} bearish · 😶 {n_neutral} neutrale."
             )
+            if n_prescreened:
+                st.caption(
+                    f"⚡ {n_prescreened} af {n_total} kommentarer afgjort af leksikon-filteret "
+                    f"(sparede FinBERT-kald)."
+                )
+            if score_ci is not None:
+                st.caption(
+                    f"95%-interval for scoren: **{score_ci[0]:.0f} til {score_ci[1]:.0f}** "
+                    f"(bredde {score_ci[1] - score_ci[0]:.0f})."
+                )
 
 # ------------------- RAD 2: NYHEDS-SENTIMENT -------------------
 
@@ -609,6 +985,8 @@ for name, symbol in zip(names, stocks):
         posts_used,
         raw_comments_count,
         fetch_time,
+        score_ci,
+        n_prescreened,
     ) = results_reddit[symbol]
 
     with st.expander(f"{name} (`{symbol}`) – Reddit-kommentarer"):
@@ -617,19 +995,25 @@ for name, symbol in zip(names, stocks):
             continue
 
         if bull_ex:
-            text, title, _, conf = bull_ex
+            text, title, _, conf, stage = bull_ex
             st.markdown("#### 🐂 Bullish kommentar")
             st.caption(f"Fra opslaget: *{title}*")
-            st.caption(f"Model-sikkerhed: {conf:.2f}")
+            if stage == "lexicon":
+                st.caption("Afgjort af leksikon-filteret (ingen model-sikkerhed).")
+            else:
+                st.caption(f"Model-sikkerhed: {conf:.2f}")
             st.write(text)
         else:
             st.info("Ingen tydeligt bullish kommentar fundet lige nu.")
         st.markdown("---")
         if bear_ex:
-            text, title, _, conf = bear_ex
+            text, title, _, conf, stage = bear_ex
             st.markdown("#### 🐻 Bearish kommentar")
             st.caption(f"Fra opslaget: *{title}*")
-            st.caption(f"Model-sikkerhed: {conf:.2f}")
+            if stage == "lexicon":
+                st.caption("Afgjort af leksikon-filteret (ingen model-sikkerhed).")
+            else:
+                st.caption(f"Model-sikkerhed: {conf:.2f}")
             st.write(text)
         else:
             st.info("Ingen tydeligt bearish kommentar fundet lige nu.")